@@ -1,6 +1,22 @@
 import pandas as pd
 import numpy as np
+from scipy.linalg.blas import ssyrk
 from scipy.stats import boxcox, skew
+from inspectdata import cached_numeric_columns, column_moments
+
+
+def _boxcox(arr):
+    out = np.full_like(arr, np.nan)
+    valid = ~np.isnan(arr)
+    out[valid] = boxcox(arr[valid] + 1)[0] # +1 to avoid issues with zero values, fitted on non-null values only
+    return out
+
+
+_TRANSFORMS = {
+    'log': np.log1p,
+    'sqrt': np.sqrt,
+    'boxcox': _boxcox,
+}
 
 
 class DataFrameTransform:
@@ -12,6 +28,9 @@ class DataFrameTransform:
         __init__(self, credentials): 
             Initialises the DataFrameInfo object with a given DataFrame.
 
+        numeric_columns:
+            Names of the numeric columns, cached until the DataFrame's columns or data types change.
+
         drop_nulls_over_threshold(self, threshold=50): 
             Drops columns with null value of over 50%.
 
@@ -30,12 +49,18 @@ class DataFrameTransform:
         find_best_transformation(self, col):
             Finds the best transformation for a column by comparing skewness after applying a transformation.
 
-        apply_transformations(self, skewed_columns):
+        transform_skewed_columns(self, skew_threshold=1, skewed_columns=None):
             Transforms skewed columns in the DataFrame using the best transformation method.
 
         remove_outliers(self, column):
             Removes outliers from a specified column in the DataFrame using the interquartile range method. 
 
+        remove_outliers_multi(self, columns):
+            Removes outliers from several columns at once in the DataFrame using the interquartile range method.
+
+        absolute_correlation(self):
+            Calculates the upper triangle of the absolute correlation matrix of the numeric columns.
+
         identify_highly_correlated(self, threshold=0.9):
             Identifies pairs of numeric columns in the DataFrame that are highly correlated.
 
@@ -54,6 +79,19 @@ class DataFrameTransform:
         """
 
         self.df = df
+        self._numeric_columns_cache = {}
+
+    @property
+    def numeric_columns(self):
+
+        """
+        Names of the numeric columns, cached until the DataFrame's columns or data types change.
+
+        Returns:
+            pandas.Index: Names of the numeric columns.
+        """
+
+        return cached_numeric_columns(self.df, self._numeric_columns_cache)
 
     def drop_nulls_over_threshold(self, threshold=50):
 
@@ -64,10 +102,10 @@ class DataFrameTransform:
             threshold(int): Threshold for dropping. Default is 50%.
         """
 
-        null_percentages = (self.df.isnull().sum() / len(self.df)) * 100
-        columns_to_drop = null_percentages[null_percentages > threshold].index.tolist() #creates list of values and prints them
-        print(f"Column(s) {columns_to_drop} exceed(s) threshold of 50% and has been dropped.")
-        self.df.drop(columns=columns_to_drop, inplace=True)
+        keep = self.df.isna().mean().le(threshold / 100) #fraction of nulls per column in one pass
+        columns_to_drop = self.df.columns[~keep.to_numpy()].tolist() #creates list of values and prints them
+        print(f"Column(s) {columns_to_drop} exceed(s) threshold of {threshold}% and has been dropped.")
+        self.df.drop(columns=columns_to_drop, inplace=True) #in place so other objects sharing the DataFrame see the change
         return self.df
 
     def drop_rows_in_datetime(self, column):
@@ -92,18 +130,32 @@ class DataFrameTransform:
 
         """
 
-        for col in self.df.columns:
-           if self.df[col].isnull().any():
-                if self.df[col].dtype in ['float64', 'int64']:  #numeric columns, impute with mean or median
-                    mean_value = self.df[col].mean()
-                    median_value = self.df[col].median()
-                    if abs(mean_value - median_value) / mean_value < 0.1:  #check that the difference between mean and median is within 10% of mean
-                        self.df[col] = self.df[col].fillna(mean_value)
-                    else:
-                        self.df[col] = self.df[col].fillna(median_value)
-                else: 
-                    mode_value = self.df[col].mode() #non-numeric columns, impute with mode
-
+        null_cols = self.df.columns[self.df.isnull().any().values] #only columns that actually contain nulls
+        numeric_null_cols = [col for col in null_cols if pd.api.types.is_numeric_dtype(self.df[col])]
+        other_null_cols = [col for col in null_cols if col not in numeric_null_cols]
+
+        fill_dict = {}
+        if numeric_null_cols: #numeric columns, impute with mean or median
+            agg_stats = self.df[numeric_null_cols].agg(['mean', 'median'])
+            for col in numeric_null_cols:
+                mean_value = agg_stats.at['mean', col]
+                median_value = agg_stats.at['median', col]
+                if abs(mean_value - median_value) / mean_value < 0.1:  #check that the difference between mean and median is within 10% of mean
+                    fill_dict[col] = mean_value
+                else:
+                    fill_dict[col] = median_value
+        for col in other_null_cols: #non-numeric columns, impute with most frequent value (counted, not sorted like .mode())
+            if isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                codes = self.df[col].cat.codes.to_numpy()
+                codes = codes[codes >= 0] #-1 codes are nulls
+                if codes.size:
+                    fill_dict[col] = self.df[col].cat.categories[np.bincount(codes).argmax()]
+            else:
+                counts = self.df[col].value_counts()
+                if not counts.empty: #a column with no values has nothing to impute from
+                    fill_dict[col] = counts.index[0]
+
+        self.df.fillna(fill_dict, inplace=True)
         return self.df
 
 
@@ -116,12 +168,15 @@ class DataFrameTransform:
             skew_threshold (float): Threshold for skewness. Default is 1.
 
         Returns:
-            list: Column names with skewness < skew_threshold or > skew_threshold.
+            list: Column names with skewness < -skew_threshold or > skew_threshold.
         """
 
-        skewed_columns = self.df.select_dtypes(include=['float64', 'int64']).apply(lambda x: x.skew())
-        skewed_columns = skewed_columns[(skewed_columns < skew_threshold) | (skewed_columns > skew_threshold)] #both -1 and +1
-        return skewed_columns.index.tolist()
+        numeric_data = self.df[self.numeric_columns]
+        arr = numeric_data.to_numpy(dtype=np.float64)
+        _, _, skew_values = column_moments(arr) #moments computed column-wise over the whole block
+
+        skewed_columns = numeric_data.columns[np.abs(skew_values) > skew_threshold] #both -1 and +1
+        return skewed_columns.tolist()
 
 
     def transform_column(self, col, method):
@@ -138,19 +193,14 @@ class DataFrameTransform:
             column: If column is non-numeric, returns column.
 
         """
-        if self.df[col].dtype not in ['float64', 'int64']:
+        if not pd.api.types.is_numeric_dtype(self.df[col]):
             print(f"Transformation {method} failed for column {col}: Non-numeric data type")
-        return self.df[col]
-    
-        if method == 'log':
-            return np.log1p(self.df[col])
-        elif method == 'sqrt':
-            return np.sqrt(self.df[col])
-        elif method == 'boxcox':
-            transformed_col = boxcox(self.df[col] + 1)[0] # +1 to avoid issues with zero or negative values
-            return pd.Series(transformed_col, index=self.df.index)  # numpy array back to pandas Series
-        else:
+            return self.df[col]
+
+        if method not in _TRANSFORMS:
             raise ValueError("Invalid transformation method")
+        arr = self.df[col].to_numpy(dtype=np.float64)
+        return pd.Series(_TRANSFORMS[method](arr), index=self.df.index, name=col)  # numpy array back to pandas Series
 
     def find_best_transformation(self, col):
 
@@ -165,36 +215,39 @@ class DataFrameTransform:
             pandas.Series: The transformed column using the best method.
         """
 
-        transformations = ['log', 'sqrt', 'boxcox']
-        best_method = None
-        best_skew = np.inf
-        best_transformed_col = self.df[col]
+        if not pd.api.types.is_numeric_dtype(self.df[col]):
+            print(f"Transformation failed for column {col}: Non-numeric data type")
+            return None, self.df[col]
+
+        arr = self.df[col].to_numpy(dtype=np.float64) #read the column once and reuse the array for every method
+        methods = list(_TRANSFORMS)
+        if np.nanmin(arr) < 0: #boxcox needs positive data, +1 only handles zeros
+            methods.remove('boxcox')
+        transformed = {method: _TRANSFORMS[method](arr) for method in methods}
 
-        for method in transformations:
-            transformed_col = self.transform_column(col, method)
-            skewness = transformed_col.skew()
-            if abs(skewness) < abs(best_skew):
-                best_skew = skewness
-                best_method = method
-                best_transformed_col = transformed_col
+        skews = np.array([skew(transformed[method], bias=False, nan_policy='omit') for method in methods]) #bias=False matches pandas .skew()
+        best_method = methods[np.nanargmin(np.abs(skews))]
+        best_transformed_col = pd.Series(transformed[best_method], index=self.df.index, name=col) #only the winner is wrapped back into a Series
 
         return best_method, best_transformed_col
 
 
-    def transform_skewed_columns(self, skew_threshold=1):
+    def transform_skewed_columns(self, skew_threshold=1, skewed_columns=None):
         """
     
         Transforms skewed columns in the DataFrame using the best transformation method.
 
         Parameters:
             skew_threshold (float): The skewness threshold to use for identifying skewed columns.
+            skewed_columns (list): Columns already returned by identify_skewed_columns(), skewness is recalculated if not given.
 
         Returns:
             pandas.DataFrame: The DataFrame with transformed columns.
 
         """
         
-        skewed_columns = self.identify_skewed_columns(skew_threshold)
+        if skewed_columns is None:
+            skewed_columns = self.identify_skewed_columns(skew_threshold)
 
         for col in skewed_columns:
             best_method, best_transformed_col = self.find_best_transformation(col)
@@ -225,7 +278,59 @@ class DataFrameTransform:
             upper_bound = Q3 + 1.5 * IQR
             self.df = self.df[(self.df[column] >= lower_bound) & (self.df[column] <= upper_bound)]
         return self.df
+
+    def remove_outliers_multi(self, columns):
+
+        """
+
+        Removes outliers from several columns at once in the DataFrame using the interquartile range method.
+        Quartiles for all columns are calculated together and a row is kept only if it is within bounds in every column.
+
+        Parameters:
+            columns (list): The names of the columns from which outliers will be removed. Non-numeric columns are skipped.
+
+        Returns:
+            pandas.DataFrame: A new DataFrame with outliers removed from the specified columns.
+
+        """
+
+        columns = [col for col in columns if pd.api.types.is_numeric_dtype(self.df[col])]
+        if not columns:
+            return self.df
+
+        quartiles = self.df[columns].quantile([0.25, 0.75]).to_numpy()
+        IQR = quartiles[1] - quartiles[0]
+        lower_bound = quartiles[0] - 1.5 * IQR
+        upper_bound = quartiles[1] + 1.5 * IQR
+        values = self.df[columns].to_numpy(dtype=np.float64)
+        mask = ((values >= lower_bound) & (values <= upper_bound)).all(axis=1) #single row mask across all columns
+        self.df = self.df[mask]
+        return self.df
         
+    def absolute_correlation(self):
+
+        """
+        Calculates the upper triangle of the absolute correlation matrix of the numeric columns.
+        Columns are standardised once as float32 and the matrix comes from a single BLAS syrk call (X^T X), which only computes one triangle.
+        If any value is null, pandas' .corr() is used instead, as it correlates each pair over the rows where both values are present.
+
+        Returns:
+            tuple:
+                pandas.Index: Names of the numeric columns.
+                numpy.ndarray: Absolute correlations, filled above and on the diagonal only.
+
+        """
+
+        numeric_data = self.df[self.numeric_columns]
+        if numeric_data.isna().to_numpy().any(): #mean-filled nulls would pull every correlation towards zero
+            return numeric_data.columns, np.triu(np.abs(numeric_data.corr().to_numpy()))
+
+        X = np.asfortranarray(numeric_data.to_numpy(dtype=np.float32)) #BLAS works on column-major data, no copy if already in that order
+        X -= X.mean(axis=0)
+        X /= X.std(axis=0) + 1e-12 #constant columns end up with 0 correlation
+        correlation_matrix = ssyrk(1.0 / len(X), X, trans=1, lower=0)
+        return numeric_data.columns, np.abs(correlation_matrix)
+
     def identify_highly_correlated(self, threshold=0.9):
 
         """
@@ -239,18 +344,13 @@ class DataFrameTransform:
 
         """
    
-        numeric_data = self.df.select_dtypes(include=['float64', 'int64'])
-        correlation_matrix = numeric_data.corr().abs()
+        columns, correlation_matrix = self.absolute_correlation()
 
-        highly_correlated_pairs = []
-        columns = correlation_matrix.columns
-
-        for i in range(len(columns)):
-            for j in range(i + 1, len(columns)):
-                if correlation_matrix.iloc[i, j] > threshold:
-                    pair = (columns[i], columns[j])
-                    highly_correlated_pairs.append(pair)
+        upper_triangle = np.triu(np.ones(correlation_matrix.shape, dtype=bool), k=1) #each pair only once, excludes diagonal
+        i_idx, j_idx = np.where(upper_triangle & (correlation_matrix > threshold))
+        columns = columns.to_numpy()
 
+        highly_correlated_pairs = list(zip(columns[i_idx], columns[j_idx]))
         return highly_correlated_pairs
 
     def remove_highly_correlated_columns(self, threshold=0.9):
@@ -258,6 +358,7 @@ class DataFrameTransform:
         """
         
         Removes columns from the DataFrame that are highly correlated with each other.
+        Of each highly correlated pair the later column is removed; these are read straight from the correlation mask, no list of pairs is built.
 
         Parameters:
             threshold (float): Threshold above which columns considered highly correlated. Defaulted to 0.9.
@@ -269,10 +370,10 @@ class DataFrameTransform:
     
         """
 
-        correlated_columns = self.identify_highly_correlated(threshold)
-        columns_to_remove = set()
-        for col1, col2 in correlated_columns:
-            columns_to_remove.add(col2)
+        columns, correlation_matrix = self.absolute_correlation()
+
+        upper_triangle = np.triu(correlation_matrix > threshold, k=1)
+        columns_to_remove = set(columns[upper_triangle.any(axis=0)]) #second column of every highly correlated pair
         self.df.drop(columns=columns_to_remove, inplace=True)
         return self.df, columns_to_remove
 
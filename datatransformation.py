@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 class DataTransform:
 
@@ -15,8 +16,11 @@ class DataTransform:
         convert_date_object_to_datetime(self, columns):
             Converts specified columns containing date objects to datetime format with specified format.
 
-        convert_to_categorical(self, columns):
-            Converts specified columns to categorical type.
+        convert_to_categorical(self, columns, ordered_columns=None):
+            Converts specified columns to categorical type, ordered for columns with a natural order.
+
+        downcast_numeric(self):
+            Downcasts float64 and int64 columns to the smallest numeric type that holds their values.
             
         apply_transformations(self):
             Applies all transformations defined for the DataFrame.
@@ -41,7 +45,7 @@ class DataTransform:
 
         """
         Converts specified columns containing mixed data types to integer after extracting numeric part.
-        Fills NaNs with 0.
+        Fills NaNs with 0. Each column gets the smallest integer type that holds its values (e.g. int8 for 36 months or 10+ years).
 
         Parameters:
             columns (list): List of column names to convert.
@@ -51,12 +55,22 @@ class DataTransform:
 
         """
         
+        extracted = {}
         for col in columns:
             try:
-                self.df[col] = self.df[col].str.extract('(\d+)').fillna(0).astype(int)
-                print(f"Converted column '{col}' to integer format.")
+                strings = self.df[col].astype('string[pyarrow]') #arrow string kernels run the regex in C
+                extracted[col] = pd.to_numeric(strings.str.extract(r'(\d+)', expand=False), errors='coerce')
             except Exception as e:
                 print(f"Error converting column '{col}': {e}")
+        if extracted: #fill and cast all converted columns together, written back in one assignment
+            try:
+                filled = pd.DataFrame(extracted).fillna(0)
+                converted = {col: pd.to_numeric(filled[col].to_numpy(), downcast='integer') for col in filled} #width picked from the data so large values don't wrap
+                self.df[list(converted)] = pd.DataFrame(converted, index=filled.index)
+                for col in extracted:
+                    print(f"Converted column '{col}' to integer format.")
+            except Exception as e:
+                print(f"Error converting columns {list(extracted)}: {e}")
         return self.df
         
 
@@ -74,30 +88,70 @@ class DataTransform:
         
         """
         date_format = "%b-%Y"
+        unique_dates = pd.unique(self.df[columns].to_numpy().ravel('K')) #each month string parsed once across all columns
+        unique_dates = unique_dates[pd.notna(unique_dates)]
+        parsed_dates = pd.Series(pd.to_datetime(unique_dates, format=date_format, errors='coerce'), index=unique_dates)
         for col in columns:
-                self.df[col] = pd.to_datetime(self.df[col], format=date_format, errors='coerce')
+                self.df[col] = self.df[col].map(parsed_dates)
                 print(f"Converted column '{col}' to datetime format.")
         return self.df
 
-    def convert_to_categorical(self, columns):
+    def convert_to_categorical(self, columns, ordered_columns=None):
 
         """
         Converts specified columns to categorical type.
 
         Parameters:
             columns (list): List of column names to convert.
+            ordered_columns (list): Column names with a natural order (e.g. grade), converted to ordered categories sorted by value.
 
         Returns:
             pandas.DataFrame: DataFrame with specified columns converted to categorical type.
 
         
         """
+        ordered_columns = ordered_columns or []
+        dtypes = {}
         for col in columns:
             try:
-                self.df[col] = self.df[col].astype('category')
-                print(f"Converted column '{col}' to categorical format.")
+                values = self.df[col] #missing columns fail here and are left out of the batch
+                if col in ordered_columns:
+                    dtypes[col] = pd.CategoricalDtype(sorted(values.dropna().unique()), ordered=True)
+                else:
+                    dtypes[col] = pd.CategoricalDtype()
             except Exception as e:
                 print(f"Error converting column '{col}': {e}")
+        try: #single astype for all columns, written back in one assignment
+            self.df[list(dtypes)] = self.df[list(dtypes)].astype(dtypes)
+            for col in dtypes:
+                print(f"Converted column '{col}' to categorical format.")
+        except Exception:
+            for col, dtype in dtypes.items(): #batch failed, convert column by column so one bad column doesn't stop the rest
+                try:
+                    self.df[col] = self.df[col].astype(dtype)
+                    print(f"Converted column '{col}' to categorical format.")
+                except Exception as e:
+                    print(f"Error converting column '{col}': {e}")
+        return self.df
+
+    def downcast_numeric(self):
+
+        """
+        Downcasts float64 columns to float32 only if every value survives the round trip exactly, and int64 columns to the smallest integer
+        type that holds their values. Money columns like instalment can't be stored exactly as float32, so they stay float64.
+
+        Returns:
+            pandas.DataFrame: DataFrame with numeric columns downcast.
+
+        """
+        for col in self.df.select_dtypes(include='float64').columns:
+            values = self.df[col].to_numpy()
+            downcast = values.astype(np.float32)
+            if np.array_equal(downcast.astype(np.float64), values, equal_nan=True): #to_numeric(downcast='float') also accepts approximate values
+                self.df[col] = downcast
+        for col in self.df.select_dtypes(include='int64').columns:
+            self.df[col] = pd.to_numeric(self.df[col], downcast='integer')
+        print("Downcast numeric columns to smaller data types.")
         return self.df
         
 
@@ -113,11 +167,12 @@ class DataTransform:
         columns_to_transform_mixed_obj_to_int = ['term', 'employment_length']
         columns_to_transform_date_object_to_datetime = ['issue_date', 'earliest_credit_line', 'last_payment_date', 'last_credit_pull_date']
         columns_to_transform_to_categorical = ['grade', 'sub_grade', 'home_ownership', 'verification_status', 'loan_status', 'payment_plan','purpose','policy_code', 'application_type']
+        columns_with_order = ['grade', 'sub_grade']
 
       
         self.convert_mixed_obj_to_int(columns_to_transform_mixed_obj_to_int)
         self.convert_date_object_to_datetime(columns_to_transform_date_object_to_datetime)
-        self.convert_to_categorical(columns_to_transform_to_categorical)
+        self.convert_to_categorical(columns_to_transform_to_categorical, columns_with_order)
 
         print("All transformations successfully completed.")
         return self.df
@@ -1,3 +1,5 @@
+import io
+from contextlib import closing
 import pandas as pd
 import psycopg2
 import yaml
@@ -28,10 +30,10 @@ class RDSDatabaseConnector:
             The data is stored in a table called loan_payments.
 
         save_data(self, dataframe, filename): 
-            Saves the data as a CSV file to local machine. 
+            Saves the data as a Parquet file to local machine. 
 
         load_data(self, filename): 
-            Loads data from CSV file into a Pandas DataFrame.
+            Loads data from Parquet file into a Pandas DataFrame.
     """
     
     def __init__(self, credentials):
@@ -88,30 +90,33 @@ class RDSDatabaseConnector:
         """
         Extracts data from the RDS database and returns it as a Pandas DataFrame.
         The data is stored in a table called 'loan_payments'.
+        The table is exported with PostgreSQL's COPY and parsed by pandas' C CSV parser, so no Python object is created per row or cell.
 
         Returns:
             A DataFrame containing the loan payments data.
         """
-        conn = self.connect_to_database()
-        query = "SELECT * FROM loan_payments;"
-        df = pd.read_sql(query, conn)
+        buffer = io.StringIO()
+        with closing(self.connect_to_database()) as conn, conn.cursor() as cur: #connection is closed even if the COPY fails
+            cur.copy_expert("COPY loan_payments TO STDOUT WITH CSV HEADER", buffer)
+        buffer.seek(0)
+        df = pd.read_csv(buffer)
         print("Successfully extracted loan payments data!")
-        conn.close()
         return df
     
     def save_data(self, dataframe, filename):
         """
-        Saves the data to a CSV file on local machine.
+        Saves the data to a Parquet file on local machine.
+        Parquet keeps the column data types, so they do not need converting again after loading.
 
         Parameters:
             dataframe (pandas.DataFrame): The DataFrame to save.
             filename (str): The name of the file to save the data to.
         """
-        dataframe.to_csv(filename, index=False)
+        dataframe.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
     
     def load_data(self, filename):
         """
-        Loads data from a CSV file into a Pandas DataFrame.
+        Loads data from a Parquet file into a Pandas DataFrame.
 
         Parameters:
             filename (str): The name of the file to load the data from.
@@ -119,6 +124,6 @@ class RDSDatabaseConnector:
         Returns:
             A DataFrame containing the loaded data.
         """
-        df = pd.read_csv(filename)
+        df = pd.read_parquet(filename, engine='pyarrow')
         print(f"Loaded data from {filename} successfully!")
         return df
\ No newline at end of file
@@ -1,5 +1,54 @@
+import numpy as np
 import pandas as pd
 
+
+def column_moments(arr):
+
+    """
+    Calculates the mean, variance and skewness of every column of a 2-D array with NumPy reductions over the whole block, no loop over columns.
+    The mean and the squared deviations are calculated once and reused for the higher moments, at the cost of a few passes over the data
+    and two temporary arrays the size of arr (the deviations and their squares). NaNs are ignored.
+
+    Parameters:
+        arr (numpy.ndarray): 2-D float array with one column per variable.
+
+    Returns:
+        tuple: numpy.ndarray of means, population variances and bias corrected skewness (same as pandas .skew()) per column.
+    """
+
+    n = np.count_nonzero(~np.isnan(arr), axis=0)
+    mean = np.nanmean(arr, axis=0)
+    deviations = arr - mean
+    squared = deviations * deviations
+    m2 = np.nanmean(squared, axis=0)
+    m3 = np.nanmean(squared * deviations, axis=0) #reuses squared deviations rather than cubing again
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skewness = m3 / m2 ** 1.5 * np.sqrt(n * (n - 1)) / (n - 2)
+    return mean, m2, skewness
+
+
+def cached_numeric_columns(df, cache):
+
+    """
+    Returns the names of the numeric columns of a DataFrame, reusing the result stored in cache while the columns and their data types are unchanged.
+    The DataFrame is shared between classes and converted in place, so a change of dtype (e.g. to categorical) has to invalidate the cache too.
+
+    Parameters:
+        df (pandas.DataFrame): The DataFrame to select numeric columns from.
+        cache (dict): Dictionary owned by the caller, holding the last result and what it was calculated from.
+
+    Returns:
+        pandas.Index: Names of the numeric columns.
+    """
+
+    dtypes = tuple(df.dtypes)
+    if cache.get('columns') is not df.columns or cache.get('dtypes') != dtypes: #dropping columns or replacing the DataFrame gives a new columns Index
+        cache['numeric_columns'] = df.select_dtypes(include='number').columns
+        cache['columns'] = df.columns
+        cache['dtypes'] = dtypes
+    return cache['numeric_columns']
+
+
 class DataFrameInfo:
 
     """
@@ -9,6 +58,9 @@ class DataFrameInfo:
         __init__(self, credentials): 
             Initialises the DataFrameInfo object with a given DataFrame.
 
+        numeric_columns:
+            Names of the numeric columns, cached until the DataFrame's columns or data types change.
+
         describe_types(self): 
             Returns data types of columns.
 
@@ -21,8 +73,8 @@ class DataFrameInfo:
         count_nulls(self):
             Counts null values in each column. 
 
-        percentage_of_zeros(self, column):
-            Calculates the percentage of zeros in the specified column.
+        percentage_of_zeros(self):
+            Calculates the percentage of zeros in each numeric column.
     """
 
     def __init__(self, df):
@@ -35,6 +87,19 @@ class DataFrameInfo:
         """
 
         self.df = df
+        self._numeric_columns_cache = {}
+
+    @property
+    def numeric_columns(self):
+
+        """
+        Names of the numeric columns, cached until the DataFrame's columns or data types change.
+
+        Returns:
+            pandas.Index: Names of the numeric columns.
+        """
+
+        return cached_numeric_columns(self.df, self._numeric_columns_cache)
 
     def describe_types(self):
 
@@ -46,7 +111,7 @@ class DataFrameInfo:
         """
 
         return self.df.dtypes
-        
+
     def describe_stats(self):
 
         """
@@ -56,12 +121,18 @@ class DataFrameInfo:
             dict: A dictionary where keys are column names and values are dictionaries containing mean, median, and mode statistics.
         """
 
+        numeric_data = self.df[self.numeric_columns]
+        arr = numeric_data.to_numpy(dtype=np.float64)
+        means, _, _ = column_moments(arr)
+        medians = np.nanmedian(arr, axis=0)
+
         stats = {}
-        for col in self.df.select_dtypes(include='number').columns:
+        for i, col in enumerate(numeric_data.columns):
+            mode = numeric_data[col].mode()
             stats[col] = {
-                'mean': self.df[col].mean() if self.df[col].dtype in ['float64', 'int64'] else None,
-                'median': self.df[col].median() if self.df[col].dtype in ['float64', 'int64'] else None,
-                'mode': self.df[col].mode()[0] if not self.df[col].mode().empty else None,
+                'mean': means[i],
+                'median': medians[i],
+                'mode': mode[0] if not mode.empty else None,
             
             }
         return stats
@@ -98,22 +169,19 @@ class DataFrameInfo:
 
     def percentage_of_zeros(self):
         """
-        Calculates the percentage of zeros in the specified column.
-
-        Parameters:
-            column (str): The name of the column to calculate the percentage of zeros for.
+        Calculates the percentage of zeros in each numeric column.
 
         Returns:
-            float: The percentage of zeros in the specified column.
+            pandas.Series: The percentage of zeros in each numeric column.
         """
 
-        for col in self.df.columns:
-            if pd.api.types.is_numeric_dtype(self.df[col]):
-                total_count = len(self.df[col])
-                if total_count == 0:
-                    zero_percentage = 0.0
-                else:
-                    zero_count = (self.df[col] == 0).sum()
-                    zero_percentage = (zero_count / total_count) * 100
-                
-                print(f"Percentage of zeros in column '{col}': {zero_percentage:.2f}%")
\ No newline at end of file
+        numeric_data = self.df[self.numeric_columns]
+        arr = numeric_data.to_numpy()
+        if len(arr) == 0:
+            zero_percentages = pd.Series(0.0, index=numeric_data.columns)
+        else:
+            zero_percentages = pd.Series((arr == 0).sum(axis=0) * (100.0 / len(arr)), index=numeric_data.columns) #one comparison over the whole numeric block
+
+        for col, zero_percentage in zero_percentages.items():
+            print(f"Percentage of zeros in column '{col}': {zero_percentage:.2f}%")
+        return zero_percentages
\ No newline at end of file
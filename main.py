@@ -1,4 +1,6 @@
-import pandas as pd
+import os
+import matplotlib
+matplotlib.use('Agg') #no GUI, every figure is saved to the plots folder instead of shown
 from db_utils import RDSDatabaseConnector
 from datatransformation import DataTransform
 from inspectdata import DataFrameInfo
@@ -35,24 +37,31 @@ def main():
     """
 
     df = load_data()
+    os.makedirs('plots', exist_ok=True)
 
-    #use csv file as a copy
-    df.to_csv('loan_payments_transformed.csv', index=False)
-    print("Transformed DataFrame saved as 'loan_payments_transformed.csv'.")
-    df = pd.read_csv('loan_payments_transformed.csv')
+    #save a parquet copy of the data as loaded, carry on with the DataFrame already in memory
+    df.to_parquet('loan_payments_transformed.parquet', engine='pyarrow', compression='zstd', index=False)
+    print("Transformed DataFrame saved as 'loan_payments_transformed.parquet'.")
+
+    #downcast before any other step so everything later works on smaller columns
+    DataTransform(df).downcast_numeric()
     
     info = DataFrameInfo(df)
     plotter = Plotter(df)
     transformer = DataTransform(df)
     dftransform = DataFrameTransform(df)
     analysis = Visualisations(df)
+
+    #convert types before any inspection so categorical columns are compact for every later step
+    #done after the copy as parquet can't store integer categories like policy_code
+    transformer.apply_transformations()
     
     #initial info about data
     types = info.describe_types()
     print("Initial Data Types:\n", types)
     total_nulls = info.count_nulls()
     print("Initial Null Values:\n", total_nulls)
-    plotter.plot_null_values()
+    plotter.plot_null_values(savepath='plots/nulls_initial.png')
     info.percentage_of_zeros()    
     stats = info.describe_stats()
     print("Descriptive Statistics:\n", stats)
@@ -64,7 +73,6 @@ def main():
     dftransform.drop_nulls_over_threshold()
     dftransform.drop_rows_in_datetime("last_payment_date")
     dftransform.drop_rows_in_datetime("last_credit_pull_date")
-    transformer.apply_transformations()
     dftransform.impute_missing_values() 
 
     #info following transformations
@@ -72,27 +80,26 @@ def main():
     print("Transformed Data Types:\n", types)
     total_nulls = info.count_nulls()
     print("Transformed Null Values:\n", total_nulls)
-    plotter.plot_null_values()
+    plotter.plot_null_values(savepath='plots/nulls_transformed.png')
+
+    #numeric columns don't change from here on, select them once
+    numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
 
     #deal with outliers, fix
-    numeric_columns = df.select_dtypes(include=['float64', 'int64']).columns
-    for column in numeric_columns:
-        plotter.plot_scatter_plot(column)
-    for col in df.select_dtypes(include=['number']).columns:
-        dftransform.remove_outliers(col)
+    plotter.plot_boxplots(numeric_columns, savepath='plots/boxplots.png')
+    dftransform.remove_outliers_multi(numeric_columns)
 
     #deal with skewness, fix
-    for col in df.select_dtypes(include=['number']).columns:
-        plotter.plot_distribution(col)
+    plotter.plot_distribution_grid(numeric_columns, savepath='plots/distributions.png')
     skewed_columns = dftransform.identify_skewed_columns(skew_threshold=1)
     print("Skewed columns:\n", skewed_columns)
-    dftransform.transform_skewed_columns()
+    dftransform.transform_skewed_columns(skewed_columns=skewed_columns) #reuse the skewness already calculated
     print("Skewed columns:\n", skewed_columns)
 
     #plot high correlation, decided not to remove columns as all relevant
-    plotter.plot_correlation_matrix()
+    plotter.plot_correlation_matrix(savepath='plots/correlation_matrix.png')
 
-    analysis.loan_recovery_graphs()
+    analysis.loan_recovery_graphs(savepath='plots/loan_recovery.png')
     analysis.losses_calc()
     analysis.display_charged_off_loans_info()
     analysis.projected_loss_calc()
@@ -101,10 +108,9 @@ def main():
     analysis.at_risk_customers_calculation() #check calculation
     analysis.at_risk_customers_visualisation() #final part incomplete, on to do list
 
-    analysis.create_subset()
-    analysis.analyse_grade()
-    analysis.analyse_purpose()
-    analysis.analyse_home_ownership()
+    analysis.analyse_grade(savepath='plots/grade.png')
+    analysis.analyse_purpose(savepath='plots/purpose.png')
+    analysis.analyse_home_ownership(savepath='plots/home_ownership.png')
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,32 @@
+import math
+import os
 import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
+import numpy as np
+
+try:
+    import cupy as cp #optional, only used for large correlation matrices when a GPU is available
+except ImportError:
+    cp = None
+
+
+def show_or_save(fig, savepath=None):
+
+    """
+    Shows a figure, or saves it to savepath and closes it straight away so batch runs don't wait on a GUI or hold on to figures.
+
+    Parameters:
+        fig (matplotlib.figure.Figure): The figure to show or save.
+        savepath (str): File to save the figure to. Default is None, which shows the figure instead.
+    """
+
+    if savepath is None:
+        plt.show()
+    else:
+        fig.savefig(savepath, dpi=100, bbox_inches='tight')
+        plt.close(fig)
+
 
 class Plotter:
 
@@ -11,17 +37,26 @@ class Plotter:
         __init__(self, credentials): 
             Initialises the DataFrameInfo object with a given DataFrame.
 
-        plot_null_values(self): 
+        plot_null_values(self, savepath=None): 
             Generates a heatmap of null values.
             Generates a bar chart of null values if these exist and prints a message if no null values exist.
 
-        plot_distribution(self, column):
+        draw_histogram(self, column, ax):
+            Draws a histogram of a column onto the given axes using np.histogram.
+
+        plot_distribution(self, column, savepath=None):
             Generates a histogram of distribution of data in a column to inspect skewness. 
 
-        plot_scatterplot(self, column):
-            Generates a scatterplot of data in a column to inspect outliers.
+        plot_distribution_grid(self, columns, ncols=4, savepath=None):
+            Generates histograms of the distribution of several columns in one figure.
+
+        plot_scatterplot(self, column, max_points=50000, savepath=None):
+            Generates a scatterplot of data in a column to inspect outliers, sampling large columns down to max_points.
+
+        plot_boxplots(self, columns, savepath=None):
+            Generates boxplots of several columns on one axis to inspect outliers.
 
-        plot_correlation_matrix(self):
+        plot_correlation_matrix(self, annot_threshold=0.5, savepath=None, gpu_threshold=1_000_000):
             Generates a heatmap to visualise the correlation of data.
     """
 
@@ -36,30 +71,40 @@ class Plotter:
 
         self.df = df
 
-    
-    def plot_null_values(self):
+    def plot_null_values(self, savepath=None):
 
         """
         Generates visualisations to show missing values in the DataFrame.
 
         Two plots:
-        1. A heatmap illustrating the distribution of missing values across rows and columns.
+        1. A heatmap illustrating the distribution of missing values across rows and columns. Rows are grouped into at most 1000 bins,
+           each cell showing the fraction of nulls in that bin, so the plot stays small for large DataFrames.
         2. A vertical bar plot displaying the percentage of missing values for each column.
 
+        Parameters:
+            savepath (str): File to save the heatmap to instead of showing it, the bar plot is saved alongside with a '_percentage' suffix. Default is None.
+
         """
          
-        plt.figure(figsize=(20, 10))
-        sns.heatmap(self.df.isnull(), cbar=False, cmap="coolwarm") #colour bar removed for clearer heatmap
+        null_mask = self.df.isnull().to_numpy()
+        n_rows = null_mask.shape[0]
+        n_bins = max(min(1000, n_rows), 1)
+        bin_starts = np.linspace(0, n_rows, n_bins + 1).astype(int) #bin sizes differ by at most one row, so every row is counted
+        bin_sizes = np.diff(bin_starts)
+        binned_nulls = np.add.reduceat(null_mask, bin_starts[:-1], axis=0, dtype=np.int64) / bin_sizes[:, None] #fraction of nulls per bin of rows
+
+        fig = plt.figure(figsize=(20, 10))
+        sns.heatmap(binned_nulls, cbar=False, cmap="coolwarm", xticklabels=self.df.columns, yticklabels=False) #colour bar removed for clearer heatmap
         plt.title("Heatmap of Null Values in DataFrame")
         plt.xlabel("Columns")
-        plt.ylabel("Rows")
+        plt.ylabel(f"Rows (bins of about {n_rows // n_bins})")
         plt.title('Missing Values Percentage per Column')  
         plt.xticks(rotation=90, ha='center', fontsize=10) #rotates to vertical to make titles fit
         plt.tight_layout() #stops column titles from being clipped
-        plt.show()
+        show_or_save(fig, savepath)
         
-        plt.figure(figsize=(16, 9))
-        missing_percentage = (self.df.isnull().sum() / len(self.df)) * 100
+        fig = plt.figure(figsize=(16, 9))
+        missing_percentage = pd.Series(null_mask.mean(axis=0) * 100, index=self.df.columns) #reuses the same null mask
         missing_percentage = missing_percentage[missing_percentage > 0] #filters out columns with no missing values
         if not missing_percentage.empty:
             missing_percentage.sort_values().plot(kind='bar', color='skyblue') 
@@ -67,55 +112,164 @@ class Plotter:
             plt.ylabel('Percentage of Missing Values')
             plt.title('Missing Values Percentage per Column')
             plt.xticks(rotation=0, ha='right')  #rotates x-axis labels
-            plt.show()
+            if savepath is None:
+                show_or_save(fig)
+            else:
+                root, ext = os.path.splitext(savepath)
+                show_or_save(fig, f'{root}_percentage{ext}')
         else:
+            plt.close(fig)
             print("No missing values to plot.") #else statement added for once null values removed to reuse same method
 
-    def plot_distribution(self, column):
+    def draw_histogram(self, column, ax):
+
+        """
+        Draws a histogram of the specified column onto the given axes.
+        Counts come from np.histogram and are drawn with ax.bar, no KDE is fitted as the histogram is enough to judge skewness.
+
+        Parameters:
+            column (str): The name of the column for which the distribution is to be plotted.
+            ax (matplotlib.axes.Axes): The axes to draw on.
+        
+        """
+
+        data = self.df[column].to_numpy(dtype=np.float64)
+        data = data[~np.isnan(data)]
+        if data.size == 0:
+            return
+        bins = np.histogram_bin_edges(data, bins='auto')
+        if len(bins) > 101: #heavy tails can make 'auto' pick thousands of bins
+            bins = 100
+        counts, edges = np.histogram(data, bins=bins)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+
+    def plot_distribution(self, column, savepath=None):
 
         """
         Generates a histogram to visualise the distribution of data in the specified column of the DataFrame to understand skewness of data.
 
         Parameters:
             column (str): The name of the column for which the distribution is to be plotted.
+            savepath (str): File to save the plot to instead of showing it. Default is None.
         
         """
 
-        plt.figure(figsize=(16, 9))
-        sns.histplot(self.df[column], kde=True)
+        fig, ax = plt.subplots(figsize=(16, 9))
+        self.draw_histogram(column, ax)
         plt.title(f'Distribution of {column}')
         plt.xlabel(column)
         plt.ylabel('Frequency')
-        plt.show()
+        show_or_save(fig, savepath)
+
+    def plot_distribution_grid(self, columns, ncols=4, savepath=None):
+
+        """
+        Generates histograms to visualise the distribution of data in several columns of the DataFrame, as subplots of a single figure.
+        One figure is drawn instead of one per column.
+
+        Parameters:
+            columns (list): The names of the columns for which the distributions are to be plotted.
+            ncols (int): Number of subplots per row. Default is 4.
+            savepath (str): File to save the plot to instead of showing it. Default is None.
+        
+        """
 
-    def plot_scatter_plot(self, column):
+        if len(columns) == 0:
+            return
+        nrows = math.ceil(len(columns) / ncols)
+        fig, axes = plt.subplots(nrows, ncols, figsize=(4 * ncols, 3 * nrows), squeeze=False)
+        for ax, column in zip(axes.flat, columns):
+            self.draw_histogram(column, ax)
+            ax.set_title(f'Distribution of {column}')
+            ax.set_xlabel(column)
+            ax.set_ylabel('Frequency')
+        for ax in axes.flat[len(columns):]: #hide unused subplots in the last row
+            ax.set_visible(False)
+        plt.tight_layout()
+        show_or_save(fig, savepath)
+
+    def plot_scatter_plot(self, column, max_points=50000, savepath=None):
 
         """
         Generates a scatter plot to visualise the distribution of data in the specified column of the DataFrame to inspect outliers. 
+        Columns longer than max_points are randomly sampled down, always keeping points more than 3 standard deviations from the mean.
 
         Parameters:
             column (str): The name of the column for which the distribution is to be plotted.
+            max_points (int): Maximum number of sampled points to draw. Default is 50000.
+            savepath (str): File to save the plot to instead of showing it. Default is None.
         
         """
 
-        plt.figure(figsize=(16, 9))
-        sns.scatterplot(x=self.df.index, y=self.df[column], alpha=0.5)
+        values = self.df[column].to_numpy(dtype=np.float64)
+        n = len(values)
+        if n > max_points:
+            sample = np.random.default_rng(0).choice(n, max_points, replace=False)
+            z_scores = np.abs(values - np.nanmean(values)) / (np.nanstd(values) or 1)
+            idx = np.union1d(sample, np.flatnonzero(z_scores > 3)) #outliers are what this plot is for, keep them all
+        else:
+            idx = np.arange(n)
+
+        fig = plt.figure(figsize=(16, 9))
+        plt.scatter(self.df.index[idx], values[idx], s=4, alpha=0.5, rasterized=True)
         plt.title(f'Scatter Plot of {column}')
         plt.xlabel('Index')
         plt.ylabel(column)
-        plt.show()
+        show_or_save(fig, savepath)
+
+    def plot_boxplots(self, columns, savepath=None):
+
+        """
+        Generates boxplots to visualise the spread of data in several columns of the DataFrame to inspect outliers.
+        All columns share a single figure and axis, drawn by one plt.boxplot call, instead of one figure per column.
+
+        Parameters:
+            columns (list): The names of the columns to be plotted.
+            savepath (str): File to save the plot to instead of showing it. Default is None.
+        
+        """
+
+        if len(columns) == 0:
+            return
+        arr = self.df[columns].to_numpy(dtype=np.float64)
+        fig, ax = plt.subplots(figsize=(max(8, len(columns) * 0.4), 6))
+        ax.boxplot([arr[~np.isnan(arr[:, i]), i] for i in range(arr.shape[1])]) #boxplot can't skip NaNs itself
+        ax.set_xticks(range(1, len(columns) + 1), columns, rotation=90)
+        ax.set_title('Boxplots of Numeric Columns')
+        show_or_save(fig, savepath)
 
-    def plot_correlation_matrix(self):
+    def plot_correlation_matrix(self, annot_threshold=0.5, savepath=None, gpu_threshold=1_000_000):
 
         """
         Generates a heatmap to visualise the correlation of data. 
+        The correlation matrix comes from a single np.corrcoef call on the numeric columns as float32, with nulls treated as the column mean.
+        If cupy is installed and the data has over gpu_threshold values it is computed on the GPU instead, falling back to NumPy if no GPU can be used.
+        Only correlations stronger than annot_threshold are written on the heatmap, which is drawn as a single rasterized image.
+
+        Parameters:
+            annot_threshold (float): Absolute correlation above which a cell is annotated. Default is 0.5.
+            savepath (str): File to save the plot to instead of showing it. Default is None.
+            gpu_threshold (int): Number of values above which the GPU is used, smaller data isn't worth the copy to the device. Default is 1000000.
         
         """
 
-        numeric_data = self.df.select_dtypes(include=['float64', 'int64'])
-        correlation_matrix = numeric_data.corr()
+        numeric_data = self.df.select_dtypes(include='number')
+        arr = numeric_data.to_numpy(dtype=np.float32)
+        arr = np.nan_to_num(arr - np.nanmean(arr, axis=0)) #nulls take the column mean
+        corr = None
+        if cp is not None and arr.size > gpu_threshold:
+            try:
+                corr = cp.asnumpy(cp.corrcoef(cp.asarray(arr), rowvar=False))
+            except cp.cuda.runtime.CUDARuntimeError: #cupy installed but no usable GPU
+                corr = None
+        if corr is None:
+            with np.errstate(divide='ignore', invalid='ignore'): #constant columns have no correlation, left as NaN like pandas
+                corr = np.corrcoef(arr, rowvar=False)
+        correlation_matrix = pd.DataFrame(corr, index=numeric_data.columns, columns=numeric_data.columns)
         
-        plt.figure(figsize=(16, 9))
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', linewidths=0.5)
+        fig = plt.figure(figsize=(16, 9))
+        ax = sns.heatmap(correlation_matrix, annot=False, cmap='coolwarm', linewidths=0, rasterized=True)
+        for i, j in np.argwhere(np.abs(correlation_matrix.to_numpy()) > annot_threshold): #text only for the strong correlations
+            ax.text(j + 0.5, i + 0.5, f'{correlation_matrix.iat[i, j]:.2f}', ha='center', va='center', fontsize=7)
         plt.title('Correlation Matrix')
-        plt.show()
+        show_or_save(fig, savepath)
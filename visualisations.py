@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
+from plotter import show_or_save
 
 
 class Visualisations:
@@ -12,13 +13,22 @@ class Visualisations:
         __init__(self, credentials): 
             Initialises the DataFrameInfo object with a given DataFrame.
 
-        current_loan_recovery(self):
+        loan_status_masks(self):
+            Returns boolean masks of charged off and at risk loans, computed once per set of rows.
+
+        projected_loss(self, mask):
+            Calculates the projected revenue minus the amount paid, summed over the loans selected by a boolean mask.
+
+        funded_loans(self):
+            Returns the payment, funding and term arrays of loans with funded amounts over 1.
+
+        current_loan_recovery(self, funded=None):
             Calculates what percentage of loans are recovered against the investor funding and the total amount funded currently.
 
-        future_loan_recovery(self):
+        future_loan_recovery(self, funded=None):
             Calculates what percentage of loans would be recovered against the investor funding and the total amount funded 6 months in the future.
 
-        def loan_recovery_graphs(self):
+        def loan_recovery_graphs(self, savepath=None):
             A bar chart representing what percentage of loans are recovered against the investor funded and the total amount funded currently and in 6 months.
 
         losses_calc(self):
@@ -40,21 +50,28 @@ class Visualisations:
         at_risk_customers_visualisation(self):
             Visualises the at_risk_customers_calculation() calculations.
 
-        create_subset(self):
-            Creates subset of users who may not be able to pay off their loans.
+        status_count_tables(self):
+            Counts the values of grade, purpose and home ownership for charged off and at risk loans, computed once per set of rows.
 
-        analyse_grade(self):
+        status_counts(self, column, order):
+            Counts the values of a column for charged off loans and for at risk loans.
+
+        analyse_grade(self, savepath=None):
             Visualises the correlation between loan grade, charged off loans and late loans.
 
-        analyse_purpose(self):
+        analyse_purpose(self, savepath=None):
             Visualises the correlation between loan purpose, charged off loans and late loans.
             
-        analyse_home_ownership(self):
+        analyse_home_ownership(self, savepath=None):
             Visualises the correlation between home ownership and charged off loans and late loans.
        
     
     """
 
+    charged_off_status = 'Charged Off'
+    at_risk_statuses = ['Late (31-120 days)', 'Late (16-30 days)', 'In Grace Period']
+    analysed_columns = ['grade', 'purpose', 'home_ownership']
+
     def __init__(self, df):
         """
         Initialises the RDSDatabaseConnector with given credentials.
@@ -64,14 +81,77 @@ class Visualisations:
         
         """
         self.df = df
+        self._status_masks = None
+        self._status_masks_key = None
+        self._status_tables = None
+        self._status_tables_key = None
+
+    def loan_status_masks(self):
+
+        """
+
+        Returns boolean masks of charged off and at risk (late or in grace period) loans.
+        loan_status is compared as a categorical, so each check compares integer codes rather than strings. The masks are cached until the
+        rows of the DataFrame change (e.g. rows dropped or DataFrame replaced).
+
+        Returns:
+            charged_off_mask, at_risk_mask (tuple): Tuple of numpy.ndarray of booleans, one entry per row.
+
+        """
+
+        if self._status_masks_key is not self.df.index: #dropping rows gives a new index
+            status = self.df['loan_status'].astype('category')
+            self._status_masks = ((status == self.charged_off_status).to_numpy(), status.isin(self.at_risk_statuses).to_numpy())
+            self._status_masks_key = self.df.index
+        return self._status_masks
+
+    def projected_loss(self, mask):
+
+        """
 
+        Calculates the projected revenue (instalment * term) minus the amount already paid, summed over the loans selected by a boolean mask.
+        Works on the raw NumPy arrays in a single expression.
+
+        Parameters:
+            mask (numpy.ndarray): Boolean array selecting the loans to include, one entry per row.
+
+        Returns:
+            float: The projected loss for the selected loans.
+
+        """
+
+        instalment = self.df['instalment'].to_numpy()[mask]
+        term = self.df['term'].to_numpy()[mask]
+        total_paid = self.df['total_payment'].to_numpy()[mask]
+        return (instalment * term - total_paid).sum()
     
-    def current_loan_recovery(self):
+    def funded_loans(self):
+
+        """
+
+        Returns the payment, funding and term arrays of loans where both funded amounts are over 1.
+        The filter mask is built once and applied to the underlying NumPy arrays.
+
+        Returns:
+            total_payment, funded_amount, funded_amount_inv, term (tuple): Tuple of numpy.ndarray for the funded loans.
+
+        """
+
+        funded_amount = self.df['funded_amount'].to_numpy()
+        funded_amount_inv = self.df['funded_amount_inv'].to_numpy()
+        mask = (funded_amount > 1) & (funded_amount_inv > 1)
+        return (self.df['total_payment'].to_numpy()[mask], funded_amount[mask], funded_amount_inv[mask],
+                self.df['term'].to_numpy()[mask])
+
+    def current_loan_recovery(self, funded=None):
 
         """
 
         Calculates what percentage of loans are recovered against the investor funding and the total amount funded currently.
 
+        Parameters:
+            funded (tuple): Arrays returned by funded_loans(), computed if not given.
+
         Returns:
             recovered_percentage, recovered_investor_percentage (tuple): Tuple of floats representing the average recovery 
             percentage for the total funded amounts and the investor funded amounts of all loans.
@@ -79,48 +159,59 @@ class Visualisations:
         """
 
 
-        df_funded = self.df[(self.df['funded_amount'] > 1) & (self.df['funded_amount_inv'] > 1)]
+        total_payment, funded_amount, funded_amount_inv, _ = self.funded_loans() if funded is None else funded
     
-        if df_funded.empty:
+        if len(total_payment) == 0:
             print("No data available.")
             return None, None
     
-        recovered_percentage = (df_funded['total_payment'] / df_funded['funded_amount'] * 100).mean()
-        recovered_investor_percentage = (df_funded['total_payment'] / df_funded['funded_amount_inv'] * 100).mean()
+        recovered_percentage = (total_payment / funded_amount).mean() * 100
+        recovered_investor_percentage = (total_payment / funded_amount_inv).mean() * 100
     
         return recovered_percentage, recovered_investor_percentage
 
-    def future_loan_recovery(self):
+    def future_loan_recovery(self, funded=None):
 
         """
 
         Calculates what percentage of loans would be recovered against the investor funding and the total amount funded 6 months in the future.
 
+        Parameters:
+            funded (tuple): Arrays returned by funded_loans(), computed if not given.
+
         Returns:
             future_recovered_percentage, future_recovered_investor_percentage (tuple): Tuple of floats representing the average recovery 
             percentage for the total funded amounts and the investor funded amounts of all loans for a 6 month projection.
 
         """
 
-        df_funded = self.df[(self.df['funded_amount'] > 1) & (self.df['funded_amount_inv'] > 1)]
-        monthly_recovery_rate = df_funded['total_payment'].sum() / (df_funded['funded_amount'].sum() * df_funded['term'].mean())
-        future_recovered_percentage = (df_funded['total_payment'] / df_funded['funded_amount'] * 100).mean() + (monthly_recovery_rate * 6)
-        future_recovered_investor_percentage = (df_funded['total_payment'] / df_funded['funded_amount_inv'] * 100).mean() + (monthly_recovery_rate * 6)
+        funded = self.funded_loans() if funded is None else funded
+        total_payment, funded_amount, _, term = funded
+        monthly_recovery_rate = total_payment.sum() / (funded_amount.sum() * term.mean())
+        recovered_percentage, recovered_investor_percentage = self.current_loan_recovery(funded) #same ratios as current recovery
+        if recovered_percentage is None:
+            return None, None
+        future_recovered_percentage = recovered_percentage + (monthly_recovery_rate * 6)
+        future_recovered_investor_percentage = recovered_investor_percentage + (monthly_recovery_rate * 6)
         return future_recovered_percentage, future_recovered_investor_percentage
 
 
-    def loan_recovery_graphs(self):
+    def loan_recovery_graphs(self, savepath=None):
 
         """
 
         A bar chart representing what percentage of loans are recovered against the investor funded and the total amount funded currently and in 6 months.
 
+        Parameters:
+            savepath (str): File to save the chart to instead of showing it. Default is None.
+
         """
-        recovered_percentage, recovered_investor_percentage = self.current_loan_recovery()
+        funded = self.funded_loans() #filtered once, shared by both calculations
+        recovered_percentage, recovered_investor_percentage = self.current_loan_recovery(funded)
         print(f"Current Recovered Percentage: {recovered_percentage:.2f}%")
         print(f"Current Recovered Investor Percentage: {recovered_investor_percentage:.2f}%")
 
-        future_recovered_percentage, future_recovered_investor_percentage = self.future_loan_recovery()
+        future_recovered_percentage, future_recovered_investor_percentage = self.future_loan_recovery(funded)
         print(f"Future Recovered Percentage: {future_recovered_percentage:.2f}%")
         print(f"Future Recovered Investor Percentage: {future_recovered_investor_percentage:.2f}%")
 
@@ -135,7 +226,7 @@ class Visualisations:
             height = bar.get_height()
             ax.text(bar.get_x() + bar.get_width() / 2, height, f'{percentage:.2f}%', ha='center', va='bottom')
 
-        plt.show()
+        show_or_save(fig, savepath)
 
     def losses_calc(self):
 
@@ -149,11 +240,11 @@ class Visualisations:
 
         """
 
-        charged_off = self.df[self.df['loan_status'] == 'Charged Off']
+        charged_off_mask, _ = self.loan_status_masks()
         total_loans = len(self.df)
-        charged_off_loans = len(charged_off)
+        charged_off_loans = charged_off_mask.sum()
         charged_off_percentage = (charged_off_loans / total_loans) * 100
-        total_paid_charged_off = charged_off['total_payment'].sum()
+        total_paid_charged_off = self.df['total_payment'].to_numpy()[charged_off_mask].sum()
         
         return charged_off_percentage, total_paid_charged_off
 
@@ -180,12 +271,9 @@ class Visualisations:
         
         """
 
-        charged_off = self.df[self.df['loan_status'] == 'Charged Off']
-        projected_revenue = charged_off['instalment'] * charged_off['term']
-
-        total_paid_charged_off = charged_off['total_payment'].sum()
-        total_projected_revenue = projected_revenue.sum()
-        projected_loss = total_projected_revenue - total_paid_charged_off
+        charged_off_mask, _ = self.loan_status_masks()
+        charged_off = self.df[charged_off_mask]
+        projected_loss = self.projected_loss(charged_off_mask)
 
         return projected_loss, charged_off
         
@@ -215,23 +303,18 @@ class Visualisations:
         
         """
 
-        late_customers = ["Late (16-30 days)", "Late (31-120 days)", "In Grace Period"]
-        late_loans = self.df[self.df['loan_status'].isin(late_customers)]
+        _, late_mask = self.loan_status_masks()
 
         #percentage of late loans
         total_loans = len(self.df)
-        late_loans_num = len(late_loans)
+        late_loans_num = int(late_mask.sum())
         late_loans_percentage = (late_loans_num / total_loans) * 100
 
-        #projected loss if loan charged off
-        projected_revenue = late_loans['instalment'] * late_loans['term']
-        total_paid = late_loans['total_payment']
-        projected_loss_if_charged_off = (projected_revenue - total_paid).sum()
+        #projected loss if loan charged off, one pass over the late loans' arrays
+        projected_loss_if_charged_off = self.projected_loss(late_mask)
     
-        #projected loss if customers finish the full loan term
-        total_projected_revenue = projected_revenue.sum()
-        total_paid_amount = total_paid.sum()
-        projected_loss_if_full_term = total_projected_revenue - total_paid_amount
+        #projected loss if customers finish the full loan term, sum(revenue) - sum(paid) is the same figure as above
+        projected_loss_if_full_term = projected_loss_if_charged_off
       
         return (late_loans_percentage, late_loans_num, projected_loss_if_charged_off, projected_loss_if_full_term)
 
@@ -252,79 +335,132 @@ class Visualisations:
         print(f"Total Projected Loss if Loans Finish Full Term: £{projected_loss_if_full_term:.2f}") # both produce same outcome, check calculation
 
 
-    def create_subset(self):
+    def status_count_tables(self):
 
         """
-        Creates subset of users who may not be able to pay off their loans.
-        
+        Counts the values of each of the analysed columns for charged off loans and for at risk loans.
+        The charged off and at risk rows are selected once with the union of the loan_status masks and labelled with a status bucket,
+        then one groupby per column counts both buckets together. The tables are cached until the rows of the DataFrame change.
+
+        Returns:
+            dict: A dictionary where keys are column names and values are pandas.DataFrame of counts with 'Charged Off' and 'At Risk' columns.
+
         """
-        charged_off_statuses = ['Charged Off']
-        at_risk_customers = ['Late (31-120 days)', 'Late (16-30 days)', 'In Grace Period']
-        self.df_charged_off = self.df[self.df['loan_status'].isin(charged_off_statuses)]
-        self.df_at_risk = self.df[self.df['loan_status'].isin(at_risk_customers)]
 
-    def analyse_grade(self):
+        if self._status_tables_key is not self.df.index:
+            charged_off_mask, at_risk_mask = self.loan_status_masks()
+            selected = charged_off_mask | at_risk_mask
+            sub = self.df.loc[selected, self.analysed_columns]
+            sub = sub.assign(bucket=np.where(charged_off_mask[selected], 'Charged Off', 'At Risk')) #the two masks never overlap
+            self._status_tables = {
+                col: sub.groupby(['bucket', col], observed=True).size().unstack('bucket', fill_value=0).reindex(columns=['Charged Off', 'At Risk'], fill_value=0)
+                for col in self.analysed_columns
+            }
+            self._status_tables_key = self.df.index
+        return self._status_tables
+
+    def status_counts(self, column, order):
+
+        """
+        Counts the values of a column for charged off loans and for at risk loans, taken from the tables built by status_count_tables().
+
+        Parameters:
+            column (str): The name of the column to count, one of analysed_columns.
+            order (list): The values to count, in the order they should be plotted.
+
+        Returns:
+            charged_off_counts, at_risk_counts (tuple): Tuple of pandas.Series of counts indexed by order.
+
+        """
+
+        counts = self.status_count_tables()[column].reindex(order, fill_value=0)
+        return counts['Charged Off'], counts['At Risk']
+
+    def analyse_grade(self, savepath=None):
 
         """
         Visualises the correlation between loan grade, charged off loans and late loans.
+
+        Parameters:
+            savepath (str): File to save the chart to instead of showing it. Default is None.
         
         """
+        grade = self.df['grade']
+        if isinstance(grade.dtype, pd.CategoricalDtype) and grade.cat.ordered:
+            order = grade.cat.categories #already sorted when converted in DataTransform
+        else:
+            order = sorted(grade.dropna().unique())
+        charged_off_counts, at_risk_counts = self.status_counts('grade', order)
+
         fig, ax = plt.subplots(1, 2, figsize=(14, 6))
 
-        sns.countplot(data=self.df_charged_off, x='grade', ax=ax[0], order=sorted(self.df['grade'].unique()))
+        ax[0].bar(charged_off_counts.index.astype(str), charged_off_counts.to_numpy())
         ax[0].set_title('Loan Grade - Charged Off')
         ax[0].set_xlabel('Grade')
         ax[0].set_ylabel('Count')
 
-        sns.countplot(data=self.df_at_risk, x='grade', ax=ax[1], order=sorted(self.df['grade'].unique()))
+        ax[1].bar(at_risk_counts.index.astype(str), at_risk_counts.to_numpy())
         ax[1].set_title('Loan Grade - At Risk')
         ax[1].set_xlabel('Grade')
         ax[1].set_ylabel('Count')
 
         plt.tight_layout()
-        plt.show()
+        show_or_save(fig, savepath)
 
-    def analyse_purpose(self):
+    def analyse_purpose(self, savepath=None):
 
         """
         Visualises the correlation between loan purpose, charged off loans and late loans.
+
+        Parameters:
+            savepath (str): File to save the chart to instead of showing it. Default is None.
         
         """
 
+        order = self.df['purpose'].value_counts().index
+        charged_off_counts, at_risk_counts = self.status_counts('purpose', order)
+
         fig, ax = plt.subplots(1, 2, figsize=(14, 6))
 
-        sns.countplot(data=self.df_charged_off, y='purpose', ax=ax[0], order=self.df['purpose'].value_counts().index)
+        ax[0].barh(charged_off_counts.index.astype(str), charged_off_counts.to_numpy())
+        ax[0].invert_yaxis() #most common purpose at the top
         ax[0].set_title('Loan Purpose - Charged Off')
         ax[0].set_xlabel('Count')
         ax[0].set_ylabel('Purpose')
 
-        sns.countplot(data=self.df_at_risk, y='purpose', ax=ax[1], order=self.df['purpose'].value_counts().index)
+        ax[1].barh(at_risk_counts.index.astype(str), at_risk_counts.to_numpy())
+        ax[1].invert_yaxis()
         ax[1].set_title('Loan Purpose - At Risk')
         ax[1].set_xlabel('Count')
         ax[1].set_ylabel('Purpose')
 
         plt.tight_layout()
-        plt.show()
+        show_or_save(fig, savepath)
 
-    def analyse_home_ownership(self):
+    def analyse_home_ownership(self, savepath=None):
 
         """
         Visualises the correlation between home ownership and charged off loans and late loans.
+
+        Parameters:
+            savepath (str): File to save the chart to instead of showing it. Default is None.
         
         """
 
+        order = self.df['home_ownership'].value_counts().index
+        charged_off_counts, at_risk_counts = self.status_counts('home_ownership', order)
+
         fig, ax = plt.subplots(1, 2, figsize=(14, 6))
 
-        sns.countplot(data=self.df_charged_off, x='home_ownership', ax=ax[0], order=self.df['home_ownership'].value_counts().index)
+        ax[0].bar(charged_off_counts.index.astype(str), charged_off_counts.to_numpy())
         ax[0].set_title('Home Ownership- Charged Off')
         ax[0].set_xlabel('Home Ownership')
         ax[0].set_ylabel('Count')
 
-        sns.countplot(data=self.df_at_risk, x='home_ownership', ax=ax[1], order=self.df['home_ownership'].value_counts().index)
+        ax[1].bar(at_risk_counts.index.astype(str), at_risk_counts.to_numpy())
         ax[1].set_title('Home Ownership - At Risk')
         ax[1].set_xlabel('Home Ownership')
         ax[1].set_ylabel('Count')
 
         plt.tight_layout()
-        plt.show()
-
+        show_or_save(fig, savepath)
\ No newline at end of file